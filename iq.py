@@ -40,12 +40,12 @@
 #   adm dialout audio video input (plus user's own group, e.g., pi)
 
 import os
+import queue
 import subprocess
 import sys
 import threading
 import time
 import psutil
-import math
 
 import numpy as np
 import argparse
@@ -138,22 +138,34 @@ class LED(object):
         """ width = pixels width (& height)
             colors = dictionary with color_values and PyGame Color specs
         """
-        self.surface = pg.Surface((width, width))
+        self.width = width
         self.wd2 = width / 2
+        # Pre-draw a surface for each LED color (None = off)
+        self.variants = dict()
+        for color in [None, RED, GREEN, ORANGE]:
+            self.variants[color] = self.make_LED_surface(color)
         return
 
-    def get_LED_surface(self, color):
-        """ Set LED surface to requested color
-            Return square surface ready to blit
+    def make_LED_surface(self, color):
+        """ Draw a new LED surface in the requested color
         """
-        self.surface.fill(BGCOLOR)
+        surface = pg.Surface((self.width, self.width)).convert()  # Display format
+        surface.fill(BGCOLOR)
         # Always make full-size black circle with no fill.
-        pg.draw.circle(self.surface, BLACK, (self.wd2, self.wd2), self.wd2, 2)
+        pg.draw.circle(surface, BLACK, (self.wd2, self.wd2), self.wd2, 2)
         if color is None:
-            return self.surface
+            return surface
         # Make inset filled color circle.
-        pg.draw.circle(self.surface, color, (self.wd2, self.wd2), self.wd2 - 2, 0)
-        return self.surface
+        pg.draw.circle(surface, color, (self.wd2, self.wd2), self.wd2 - 2, 0)
+        return surface
+
+    def get_LED_surface(self, color):
+        """ Get LED surface in requested color
+            Return square surface ready to blit
+        """
+        if color not in self.variants:
+            self.variants[color] = self.make_LED_surface(color)
+        return self.variants[color]
 
 
 
@@ -182,12 +194,37 @@ class Graticule(object):
         self.opt = opt  # Store options object for accessing sample_rate, etc.
         self.sp_max = opt.sp_max  # Maximum dB value (default typically -20 dB)
         self.sp_min = opt.sp_min  # Minimum dB value (default typically -120 dB)
+        self.yscale = float(h) / (self.sp_max - self.sp_min)  # Pixels per dB
         self.font = font  # Font object for text rendering
         self.h = h  # Height of the graticule surface
         self.w = w  # Width of the graticule surface
         self.color_l = color_l  # Color for drawing grid lines
         self.color_t = color_t  # Color for rendering text labels
-        self.surface = pg.Surface((self.w, self.h))  # Create pygame surface for drawing
+        self.surface = pg.Surface((self.w, self.h)).convert()  # Drawing surface, in display format
+        self.pixels = None  # (x, y, rgb) copy of surface, refreshed by make()
+
+        # --- Frequency Scale (Horizontal Axis) ---
+        # The sample rate is fixed for the session, so the frequency ticks
+        # and their labels are worked out once here, not on every make().
+        frq_range = float(self.opt.sample_rate) / 1000.  # Total bandwidth in kHz
+        xscale = self.w / frq_range  # Pixels per kHz
+        srate2 = frq_range / 2  # Half the bandwidth (for positive/negative range)
+
+        # Determine the largest tick interval that fits within half the bandwidth
+        for xtick_max in [800, 400, 200, 100, 80, 40, 20, 10]:
+            if xtick_max < srate2:
+                break  # Exit with the first tick value less than half bandwidth
+
+        # Define frequency tick positions (symmetric around center)
+        ticks = [-xtick_max, -xtick_max / 2, 0, xtick_max / 2, xtick_max]
+
+        self.xticks = list()  # (x-position, rendered label) for each tick
+        for offset in ticks:
+            # Calculate x-position centered around the middle of the surface
+            x = offset * xscale + self.w / 2
+            # Format label: "0 kHz" for center, "+XXX" or "-XXX" for others
+            fmt = "%d kHz" if offset == 0 else "%+3d"
+            self.xticks.append((x, self.font.render(fmt % offset, 1, self.color_t)))
         return  # Explicit return not needed, included for original code fidelity
 
     def make(self):
@@ -201,13 +238,10 @@ class Graticule(object):
         """
         self.surface.fill(BLACK)  # Clear the surface with a black background
 
-        # Calculate vertical scale: pixels per dB
-        yscale = float(self.h) / (self.sp_max - self.sp_min)
-
         # Draw horizontal dB scale with lines every 10 dB
         for attn in range(self.sp_min, self.sp_max, 10):  # Iterate from min to max-10
             # Calculate y-position in pixel coordinates with a 3-pixel offset
-            yattn = ((attn - self.sp_min) * yscale) + 3.
+            yattn = ((attn - self.sp_min) * self.yscale) + 3.
             yattnflip = self.h - yattn  # Invert y since screen y increases downward
 
             # Draw horizontal grid line across the full width
@@ -222,31 +256,15 @@ class Graticule(object):
         self.surface.blit(self.font.render("dB", 1, self.color_t),
                           (5 + ww, yattnflip - 12))  # Position "dB" right of the number
 
-        # --- Frequency Scale (Horizontal Axis) ---
-        frq_range = float(self.opt.sample_rate) / 1000.  # Total bandwidth in kHz
-        xscale = self.w / frq_range  # Pixels per kHz
-        srate2 = frq_range / 2  # Half the bandwidth (for positive/negative range)
-
-        # Determine the largest tick interval that fits within half the bandwidth
-        for xtick_max in [800, 400, 200, 100, 80, 40, 20, 10]:
-            if xtick_max < srate2:
-                break  # Exit with the first tick value less than half bandwidth
-
-        # Define frequency tick positions (symmetric around center)
-        ticks = [-xtick_max, -xtick_max / 2, 0, xtick_max / 2, xtick_max]
-
-        # Draw vertical frequency ticks and labels
-        for offset in ticks:
-            # Calculate x-position centered around the middle of the surface
-            x = offset * xscale + self.w / 2
+        # Draw vertical frequency ticks and labels (made in __init__)
+        for x, label in self.xticks:
             # Draw vertical line from top to bottom
             pg.draw.line(self.surface, self.color_l, (x, 0), (x, self.h))
-            # Format label: "0 kHz" for center, "+XXX" or "-XXX" for others
-            fmt = "%d kHz" if offset == 0 else "%+3d"
-            # Render and place label 2 pixels right of the line at the top
-            self.surface.blit(self.font.render(fmt % offset, 1, self.color_t),
-                              (x + 2, 0))
+            # Place label 2 pixels right of the line at the top
+            self.surface.blit(label, (x + 2, 0))
 
+        # Keep a pixel array copy for composing the spectrum image each frame
+        self.pixels = pg.surfarray.array3d(self.surface)
         return self.surface  # Return the completed graticule surface
 
     def set_range(self, sp_min, sp_max):
@@ -267,6 +285,8 @@ class Graticule(object):
             quit_all()  # Exit program (assumes quit_all() is defined elsewhere)
         self.sp_max = sp_max  # Update maximum dB value
         self.sp_min = sp_min  # Update minimum dB value
+        # Calculate vertical scale: pixels per dB
+        self.yscale = float(self.h) / (self.sp_max - self.sp_min)
         return  # No return value needed
 
 
@@ -304,28 +324,21 @@ cpu_usage = [0., 0., 0.]
 
 def cpu_load(interval):
     """ Check CPU user and system time usage, along with load average.
-        User & system reported as fraction of wall clock time in
+        User & system reported as fraction of CPU time (all CPUs) in
         global variable cpu_usage.
         Interval defines sleep time between checks (float secs).
         To be run as thread.
     """
     global cpu_usage
-    times_store = np.array(os.times())
+    # psutil keeps the times from the previous call; this first call only
+    # sets them up.
+    psutil.cpu_times_percent(interval=None)
     # Will return: fraction usr time, sys time, and 1-minute load average
-    # cpu_usage = [0., 0., os.getloadavg()[0]]
     cpu_usage = [0., 0., psutil.getloadavg()[0]]
     while True:
         time.sleep(interval)
-        times = np.array(os.times())
-        dtimes = times - times_store  # difference since last loop
-        usr = None
-        sys = None
-        if dtimes[4] > 0 and dtimes!=None:
-            usr = dtimes[0] / dtimes[4]  # fraction, 0 - 1
-            sys = dtimes[1] / dtimes[4]
-        times_store = times
-        # cpu_usage = [usr, sys, os.getloadavg()[0]]
-        cpu_usage = [usr, sys, psutil.getloadavg()[0]]
+        times = psutil.cpu_times_percent(interval=None)  # since last loop
+        cpu_usage = [times.user / 100., times.system / 100., psutil.getloadavg()[0]]
 
 if opt.list_rigs or opt.search_rigs!=None:
     if opt.list_rigs:
@@ -377,7 +390,7 @@ w_spectra = w_main - 10  # Allow a small margin, left and right
 w_middle = w_spectra / 2  # mid point of spectrum
 x_spectra = (w_main - w_spectra) / 2.0  # x coord. of spectrum on screen
 
-h_2d = 2 * SCREEN_SIZE[1] / 3 if opt.waterfall \
+h_2d = 2 * SCREEN_SIZE[1] // 3 if opt.waterfall \
     else SCREEN_SIZE[1]  # height of 2d spectrum display
 h_2d -= 25  # compensate for LCD4 overscan?
 y_2d = 20.  # y position of 2d disp. (screen top = 0)
@@ -385,19 +398,22 @@ y_2d = 20.  # y position of 2d disp. (screen top = 0)
 # NB: transform size must be <= w_spectra.  I.e., need at least one
 # pixel of width per data point.  Otherwise, waterfall won't work, etc.
 if opt.size > w_spectra:
-    for n in [1024, 512, 256, 128]:
-        if n <= w_spectra:
-            print("*** Size was reset from %d to %d." % (opt.size, n))
-            opt.size = n  # Force size to be 2**k (ok, reasonable choice?)
-            break
+    n = dsp.fast_fft_size(w_spectra)  # Not just 2**k, any size with small factors
+    print("*** Size was reset from %d to %d." % (opt.size, n))
+    opt.size = n
 chunk_size = opt.buffers * opt.size  # No. samples per chunk (pyaudio callback)
 chunk_time = float(chunk_size) / opt.sample_rate
 
 myDSP = dsp.DSP(opt)  # Establish DSP logic
 
+# Surfaces are converted to the display pixel format, so that blits are plain
+# copies instead of per-pixel format conversions.
 # Surface for the 2d spectrum
-surf_2d = pg.Surface((w_spectra, h_2d))  # Initialized to black
-surf_2d_graticule = pg.Surface((w_spectra, h_2d))  # to hold fixed graticule
+# (24/32 bit pixels, so the spectrum image can be written in place with pixels3d)
+surf_2d = pg.Surface((w_spectra, h_2d), 0, 32)  # Initialized to black
+if surf_main.get_bitsize() >= 24:
+    surf_2d = surf_2d.convert()
+surf_2d_graticule = pg.Surface((w_spectra, h_2d)).convert()  # to hold fixed graticule
 
 # define two LED widgets
 led_urun = LED(10)
@@ -408,7 +424,7 @@ h_wf = SCREEN_SIZE[1] / 3  # Height of waterfall (3d spectrum)
 y_wf = y_2d + h_2d  # Position just below 2d surface
 
 # Surface for waterfall (3d) spectrum
-surf_wf = pg.Surface((w_spectra, h_wf))
+surf_wf = pg.Surface((w_spectra, h_wf)).convert()
 
 pg.display.set_caption(opt.ident)  # Title for main window
 
@@ -472,11 +488,30 @@ parms_msg = "Fs = %d Hz; Res. = %.1f Hz;" \
             (opt.sample_rate, float(opt.sample_rate) / opt.size, opt.size, w_spectra,
              float(opt.size * opt.buffers) / opt.sample_rate)
 wparms, hparms = medfont.size(parms_msg)
-parms_matter = pg.Surface((wparms, hparms))
+parms_matter = pg.Surface((wparms, hparms)).convert()
 parms_matter.blit(medfont.render(parms_msg, 1, TCOLOR2), (0, 0))
+# Labels for the audio status indicators
+msg_surfs = dict()
+for msg in ["Buffer underrun", "Pulse clip"]:
+    msg_surfs[msg] = medfont.render(msg, 1, BLACK, BGCOLOR)
+# Fixed screen positions for text and indicators above the 2D display
+x_freq_center = w_middle + x_spectra  # Frequency text is centered here
+ww, hh = medfont.size("Buffer underrun")
+urun_xy = (SCREEN_SIZE[0] - ww - 10, y_2d - hh)  # At right
+led_urun_xy = (urun_xy[0] - 15, y_2d - hh)
+ww, hh = medfont.size("Pulse clip")
+clip_xy = (25, y_2d - hh)  # At left
+led_clip_xy = (10, y_2d - hh)
 
 print("Update interval = %.2f ms" % float(1000 * chunk_time))
 
+# I/Q samples for the DSP, as single precision complex (complex64).
+# Half the memory traffic of complex128, and twice the SIMD width in the FFT.
+iq_buf = np.empty(chunk_size, dtype=np.complex64)  # Reused for every chunk
+buf_pairs = iq_buf.view(np.float32).reshape(-1, 2)  # (real, imag) pairs of iq_buf
+# View of Q values in iq_buf (real part if I & Q are reversed)
+im_d = buf_pairs[:, 0] if opt.rev_iq else buf_pairs[:, 1]
+
 # Initialize input mode, RTL or AF
 # This starts the input stream, so place it close to start of main loop.
 if opt.source == "rtl":  # input from RTL dongle (and freq control)
@@ -498,10 +533,97 @@ if opt.control == "si570":
     mysi570 = si570control.Si570control()
     mysi570.setFreq(opt.si570_frequency / 1000.)  # Set starting freq.
 
+# THREAD: Data acquisition and spectrum computation.
+# Reading samples and the FFTs run here, while the main loop draws the
+# previous spectrum.  (NumPy and the FFT release the GIL while they work.)
+# The queue is a single slot holding only the newest result.
+spectrum_queue = queue.Queue(maxsize=1)  # (sp_log, stats) result, or None
+FIRST_DATA_TIMEOUT = 10  # Seconds to wait for the first spectrum
+
+
+def put_latest(q, item):
+    """ Put item on single-slot queue q, replacing any item not yet taken.
+        (Only one thread may put on q.)
+    """
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()  # Drop the stale item
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+
+
+def get_spectra(q):
+    """ Read chunks of I/Q data from RTL dongle or sound card and compute
+        their log power spectra.
+        Put each (sp_log, stats) result on queue q.  Samples are read all
+        the time, so the device never waits for the display, but spectra are
+        only computed when the main loop has taken the previous result.
+        If acquisition fails (including sys.exit() in the input code),
+        put None on q instead, so the main loop can quit.
+        To be run as thread.
+    """
+    try:
+        while True:
+            # --- Data Acquisition ---
+            if opt.source == 'rtl':
+                rtl_samples = dataIn.read_samples(chunk_size)  # Read RTL-SDR samples
+                if opt.rev_iq:
+                    iq_buf.real = rtl_samples.imag
+                    iq_buf.imag = rtl_samples.real
+                else:
+                    iq_buf[:] = rtl_samples
+                iq_data_cmplx = iq_buf
+                stats = [0, 0]  # Placeholder stats
+            else:  # Audio input
+                my_in_data_s = dataIn.get_queued_data()  # Get queued audio data
+                # Stereo frames are (left, right) = (Q, I) pairs.  Copy them straight
+                # into the (real, imag) pairs of the complex buffer.
+                iq_pairs = np.frombuffer(my_in_data_s, dtype=np.int16).reshape(-1, 2)
+                if opt.rev_iq:
+                    buf_pairs[:] = iq_pairs  # Q + I * 1j
+                else:
+                    buf_pairs[:] = iq_pairs[:, ::-1]  # I + Q * 1j
+                if opt.lagfix:  # Fix PCM290x lag: rotate Q by one sample, in place
+                    last = im_d[-1]
+                    im_d[1:] = im_d[:-1]  # (NumPy handles the overlapping copy)
+                    im_d[0] = last
+                stats = [int(np.amax(iq_pairs[:, 1])), int(np.amax(iq_pairs[:, 0]))]
+                iq_data_cmplx = iq_buf
+
+            if q.full():  # Display has not taken the last spectrum yet
+                continue  # (Drop these samples, do not waste time on DSP)
+
+            # --- Compute Spectrum ---
+            sp_log = myDSP.get_log_power_spectrum(iq_data_cmplx)  # Get log power spectrum
+            if opt.source == 'rtl':
+                sp_log += 60  # Boost RTL spectrum levels
+            put_latest(q, (sp_log, stats))
+    except BaseException as err:
+        if not isinstance(err, SystemExit):  # (exit messages are printed already)
+            print("Data acquisition failed:", repr(err))
+        put_latest(q, None)  # Tell main loop to quit
+
+
+# Create thread for data acquisition and DSP.
+acq_thread = threading.Thread(target=get_spectra, args=(spectrum_queue,))
+acq_thread.daemon = True
+acq_thread.start()
+
 # ** MAIN PROGRAM LOOP **
 
 run_flag = True  # Set to False to pause for help screen or other overlays
 info_phase = 1  # > 0 shows info overlay
+last_info_phase = None  # Phase shown on previous frame
+full_redraw = True  # Repaint whole screen, not just the changing regions
+window_exposed = False  # Window was uncovered; its contents may be lost
+# Events telling us the window must be repainted
+# (WINDOWEXPOSED is only defined by pygame 2)
+EXPOSE_EVENTS = (pg.VIDEOEXPOSE, getattr(pg, 'WINDOWEXPOSED', pg.VIDEOEXPOSE))
+graticule_dirty = False  # Set when the dB range changes
+redraw_2d = True  # Compose the 2D spectrum image even without a new spectrum
 info_counter = 0  # Counter for info display timing
 tloop = 0.  # Loop timing variable
 t_last_data = 0.  # Timestamp of last data update
@@ -509,97 +631,49 @@ nframe = 0  # Frame counter
 t_frame0 = time.time()  # Start time for frame rate calculation
 led_overflow_ct = 0  # Overflow LED counter
 startqueue = True  # Flag to start data queue
-
-
-def get_gradient_color(y, y_min, y_max):
-    """Map a y-value to a color gradient from green to yellow to red.
-
-    Args:
-        y (float): Current y-value (screen coordinate, higher values = lower on screen)
-        y_min (float): Minimum y-value (top of graph)
-        y_max (float): Maximum y-value (bottom of graph)
-
-    Returns:
-        tuple: RGB color (green at y_min, yellow in middle, red at y_max)
-    """
-    # Normalize y to 0-1 range (0 at top, 1 at bottom)
-    f = (y - y_min) / (y_max - y_min) if y_max > y_min else 0
-    f = max(0, min(1, f))  # Clamp to 0-1
-
-    if f < 0.25:  # Red to Orange (0 to 0.25)
-        t = f / 0.25  # Normalize within this segment (0 to 1)
-        r = 255  # Red stays at max
-        g = int(165 * t)  # Green increases from 0 to 165
-        b = 0  # No blue
-    elif f < 0.5:  # Orange to Yellow (0.25 to 0.5)
-        t = (f - 0.25) / 0.25
-        r = 255  # Red stays at max
-        g = int(165 + 90 * t)  # Green increases from 165 to 255
-        b = 0  # No blue
-    elif f < 0.75:  # Yellow to Green (0.5 to 0.75)
-        t = (f - 0.5) / 0.25
-        r = int(255 * (1 - t))  # Red decreases from 255 to 0
-        g = 255  # Green stays at max
-        b = 0  # No blue
-    else:  # Green to Blue (0.75 to 1)
-        t = (f - 0.75) / 0.25
-        r = 0  # Red stays at 0
-        g = int(255 * (1 - t))  # Green decreases from 255 to 0
-        b = int(255 * t)  # Blue increases from 0 to 255
-
-    return (r, g, b)
-
-
-def palette_color(palette, val, vmin0, vmax0):
-    """Translate a data value into a color using different palette methods.
-
-    Args:
-        palette (int): 1 for stepped RGB (red-yellow-white), 2 for rainbow
-        val (float): Value to map (e.g., y-position or dB)
-        vmin0 (float): Minimum value for scaling
-        vmax0 (float): Maximum value for scaling
-
-    Returns:
-        tuple: RGB color values (0-255)
-    """
-    # Normalize value to 0-1 range, then scale to 0-2
-    f = (float(val) - vmin0) / (vmax0 - vmin0)  # Between 0 and 1.0
-    f *= 2  # Scale to 0-2
-    f = min(1., max(0., f))  # Clamp to 0-1 for palette range
-    if palette == 0:
-        # return 255, 255, 255
-        return 0,0,0
-    if palette == 1:  # Simple RGB stepped palette
-        g, b = 0, 0
-        if f < 0.333:  # Red phase
-            r = int(f * 255 * 3)  # Red ramps up
-        elif f < 0.666:  # Yellow phase (red + green)
-            r = 200  # Red fixed
-            g = int((f - .333) * 255 * 3)  # Green ramps up
-        else:  # White phase (red + green + blue)
-            r = 200  # Red fixed
-            g = 200  # Green fixed
-            b = int((f - .666) * 255 * 3)  # Blue ramps up
-    elif palette == 2:  # Continuous rainbow palette
-        bright = min(1.0, f + 0.15)  # Brightness adjustment
-        tpi = 2 * math.pi
-        # Use cosine waves with phase shifts for smooth color transitions
-        r = bright * 128 * (1.0 + math.cos(tpi * f))
-        g = bright * 128 * (1.0 + math.cos(tpi * f + tpi / 3))
-        b = bright * 128 * (1.0 + math.cos(tpi * f + 2 * tpi / 3))
-    else:
-        print("Invalid palette requested!")
-        sys.exit()
-
-    # Ensure color values stay within valid RGB range (0-255)
-    return max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
-
+freq_msg = None  # Frequency text last rendered
+clock = pg.time.Clock()  # Paces the main loop
+target_fps = min(60., 1.0 / chunk_time)  # No faster than data arrives, 60 fps max
+
+# Screen x of each spectrum bin, screen column numbers, and screen row numbers
+x_bins = np.arange(opt.size) * float(w_spectra) / opt.size
+x_cols = np.arange(w_spectra)
+y_rows = np.arange(h_2d)
+
+# Colors for pixels under the spectrum curve, one per screen row.
+palette = 0  # Use stepped RGB palette (can change to 2 for rainbow)
+lut = wf.build_palette_lut(palette)
+f_rows = (h_2d - y_rows) * 2. / h_2d  # White (top) to red (bottom)
+fill_lut = lut[np.clip((f_rows * (len(lut) - 1)).astype(int), 0, len(lut) - 1)]
+
+# Wait for the first spectrum
+try:
+    spectrum = spectrum_queue.get(timeout=FIRST_DATA_TIMEOUT)
+except queue.Empty:
+    print("No data from %s input after %d seconds." % (opt.source, FIRST_DATA_TIMEOUT))
+    quit_all()
+if spectrum is None:  # Acquisition failed
+    quit_all()
+sp_log, stats = spectrum
 
 while True:
     nframe += 1  # Increment frame counter for tracking loop iterations
 
-    # Reconstruct the main screen each loop
-    surf_main.fill(BGCOLOR)  # Clear main surface with background color
+    # Surfaces to draw on the main screen this frame, in order, as
+    # (surface, position).  They are all blitted with one call at the end.
+    blit_seq = []
+
+    # Only regions listed in dirty_rects are sent to the display.
+    # Repaint everything at startup, when the info overlay changes, and
+    # when the window has been uncovered.
+    if info_phase != last_info_phase or window_exposed:
+        full_redraw = True
+        last_info_phase = info_phase
+        window_exposed = False
+    if full_redraw:  # (Reset once this frame is on the display)
+        dirty_rects = [surf_main.fill(BGCOLOR)]  # Clear main surface
+    else:  # Clear just the strip for the frequency and LED indicators
+        dirty_rects = [surf_main.fill(BGCOLOR, (0, 0, w_main, y_2d))]
 
     # Process a chunk of audio/RTL data, compute log power spectrum, and update display
     # --- Display Receiver Center Frequency ---
@@ -614,10 +688,13 @@ while True:
         showfreq = False
 
     if showfreq:
-        ww, hh = lgfont.size(msg)  # Text dimensions
-        # Center frequency text above 2D display
-        surf_main.blit(lgfont.render(msg, 1, BLACK, BGCOLOR),
-                       (w_middle + x_spectra - ww / 2, y_2d - hh))
+        if msg != freq_msg:  # Render text only when the frequency changes
+            freq_msg = msg
+            freq_surf = lgfont.render(msg, 1, BLACK, BGCOLOR)
+            ww, hh = lgfont.size(msg)  # Text dimensions
+            # Center frequency text above 2D display
+            freq_xy = (x_freq_center - ww / 2, y_2d - hh)
+        blit_seq.append((freq_surf, freq_xy))
 
     # --- Audio Buffer Status Indicators ---
     if opt.source == 'audio':
@@ -627,11 +704,8 @@ while True:
             af.led_underrun_ct -= 1
         else:
             sled = led_urun.get_LED_surface(None)
-        msg = "Buffer underrun"
-        ww, hh = medfont.size(msg)
-        ww1 = SCREEN_SIZE[0] - ww - 10
-        surf_main.blit(medfont.render(msg, 1, BLACK, BGCOLOR), (ww1, y_2d - hh))
-        surf_main.blit(sled, (ww1 - 15, y_2d - hh))
+        blit_seq.append((msg_surfs["Buffer underrun"], urun_xy))
+        blit_seq.append((sled, led_urun_xy))
 
         # Clipping indicator
         if myDSP.led_clip_ct > 0:
@@ -639,72 +713,60 @@ while True:
             myDSP.led_clip_ct -= 1
         else:
             sled = led_clip.get_LED_surface(None)
-        msg = "Pulse clip"
-        ww, hh = medfont.size(msg)
-        surf_main.blit(medfont.render(msg, 1, BLACK, BGCOLOR), (25, y_2d - hh))
-        surf_main.blit(sled, (10, y_2d - hh))
-
-    # --- Data Acquisition ---
-    if opt.source == 'rtl':
-        iq_data_cmplx = dataIn.read_samples(chunk_size)  # Read RTL-SDR samples
-        if opt.rev_iq:
-            iq_data_cmplx = np.imag(iq_data_cmplx) + 1j * np.real(iq_data_cmplx)
-        time.sleep(0.05)  # Delay for slower PCs
-        stats = [0, 0]  # Placeholder stats
-    else:  # Audio input
-        my_in_data_s = dataIn.get_queued_data()  # Get queued audio data
-        iq_local = np.frombuffer(my_in_data_s, dtype=np.int16).astype('float32')
-        re_d = np.array(iq_local[1::2])  # I (right channel)
-        im_d = np.array(iq_local[0::2])  # Q (left channel)
-        if opt.lagfix:
-            im_d = np.roll(im_d, 1)  # Fix PCM290x lag
-        stats = [int(np.amax(re_d)), int(np.amax(im_d))]
-        if opt.rev_iq:
-            iq_data_cmplx = np.array(im_d + re_d * 1j)
-        else:
-            iq_data_cmplx = np.array(re_d + im_d * 1j)
+        blit_seq.append((msg_surfs["Pulse clip"], clip_xy))
+        blit_seq.append((sled, led_clip_xy))
 
-    # --- Compute Spectrum ---
-    sp_log = myDSP.get_log_power_spectrum(iq_data_cmplx)  # Get log power spectrum
-    if opt.source == 'rtl':
-        sp_log += 60  # Boost RTL spectrum levels
+    # --- Get newest spectrum from the acquisition thread, if any ---
+    # (Otherwise show the last one again; the display does not wait.)
+    try:
+        spectrum = spectrum_queue.get_nowait()
+        if spectrum is None:  # Acquisition failed
+            quit_all()
+        sp_log, stats = spectrum
+        new_spectrum = True
+    except queue.Empty:
+        new_spectrum = False
 
     # --- Draw 2D Spectrum Graph ---
-    yscale = float(h_2d) / (sp_max - sp_min)  # Pixels per dB
-    surf_2d.blit(surf_2d_graticule, (0, 0))  # Reset with graticule background
-
-    # Scale spectrum to screen coordinates
-    sp_scaled = ((sp_log - sp_min) * yscale) + 3.
-    ylist = list(sp_scaled)
-    ylist = [h_2d - x for x in ylist]  # Flip y for screen (lower dB = higher y)
-    lylist = len(ylist)
-    xlist = [x * w_spectra / lylist for x in range(lylist)]  # X coordinates
-
-    # Color pixels under the spectrum curve using palette_color
-    palette = 0  # Use stepped RGB palette (can change to 2 for rainbow)
-    for i in range(lylist):
-        x = int(xlist[i])  # Current x-position
-        y_top = int(ylist[i])  # Top of the curve (lower y = higher power)
-        y_bottom = h_2d  # Bottom of the graph
-
-        # Draw vertical line from bottom to curve with reversed palette
-        for y in range(int(y_top), int(y_bottom)):
-            # Reverse the mapping: lower y (higher power) -> lower value in palette
-            val = h_2d - y  # Invert y to map power (higher power = lower y)
-            color = palette_color(palette, val, 0, h_2d)  # White (top) to red (bottom)
-            surf_2d.set_at((x, y), color)
-
-    # Optionally draw the spectrum line on top (white outline)
-    pg.draw.lines(surf_2d, WHITE, False, list(zip(xlist, ylist)), 3)
-
-    # Blit 2D spectrum onto main surface
-    surf_main.blit(surf_2d, (x_spectra, y_2d))
+    # Only when there is something new to show: a new spectrum, or a new
+    # graticule.  Otherwise surf_2d still holds the right image.
+    draw_2d = new_spectrum or redraw_2d
+    if draw_2d:
+        redraw_2d = False
+        yscale = mygraticule.yscale  # Pixels per dB, updated by set_range()
+
+        # Scale spectrum to screen coordinates, flipped (lower dB = higher y).
+        # Same as h_2d - ((sp_log - sp_min) * yscale + 3.), in one array pass.
+        y_points = (sp_min - sp_log) * yscale + (h_2d - 3.)
+
+        # Compose the whole spectrum image in one array: graticule background,
+        # a white outline along the curve, and fill_lut colors below it.  The
+        # outline and fill masks do not overlap, so no pixel is drawn twice.
+        # Arrays are indexed (x, y), as pygame.surfarray expects.
+        y_top = np.interp(x_cols, x_bins, y_points).astype(np.int32)  # Top of curve
+        y_top_left = np.concatenate((y_top[:1], y_top[:-1]))  # ... in column to the left
+        # Outline is 3 pixels thick and joins up with the column to the left
+        line_lo = np.minimum(y_top, y_top_left) - 1
+        line_hi = np.maximum(y_top, y_top_left) + 1
+        below_lo = y_rows[None, :] >= line_lo[:, None]
+        under = y_rows[None, :] > line_hi[:, None]  # Strictly below the outline
+        spectrum_rgb = pg.surfarray.pixels3d(surf_2d)  # View of surf_2d's own pixels
+        spectrum_rgb[...] = mygraticule.pixels
+        spectrum_rgb[below_lo & ~under] = WHITE
+        np.copyto(spectrum_rgb, fill_lut[None, :, :], where=under[..., None])
+        del spectrum_rgb  # Unlock surf_2d so it can be blitted
+
+    # Blit 2D spectrum onto main surface, if changed (or the screen was cleared)
+    if draw_2d or full_redraw:
+        blit_seq.append((surf_2d, (x_spectra, y_2d)))
 
     if opt.waterfall:
-        # Calculate the new Waterfall line and blit it to main surface
+        # Calculate the new Waterfall line and blit it to main surface,
+        # unless it is still accumulating spectra for that line.
         nsum = opt.waterfall_accumulation  # 2d spectra per wf line
-        mywf.calculate(sp_log, nsum, surf_wf)
-        surf_main.blit(surf_wf, (x_spectra, y_wf + 1))
+        wf_line = new_spectrum and mywf.calculate(sp_log, nsum, surf_wf)
+        if wf_line or full_redraw:
+            blit_seq.append((surf_wf, (x_spectra, y_wf + 1)))
     if opt.disable_onscreen_help:
         info_phase = 0
     if info_phase > 0:
@@ -785,16 +847,33 @@ while True:
         # Blit newly formatted -- or old -- screen to main surface.
         if place_buttons:  # Do we have rt hand buttons to place?
             for ix, bb in enumerate(button_surfs):
-                surf_main.blit(bb, (449, button_vloc[ix]))
-        surf_main.blit(help_matter, (20, 20))
-        surf_main.blit(live_surface, (20, SCREEN_SIZE[1] - 60))
+                blit_seq.append((bb, (449, button_vloc[ix])))
+        blit_seq.append((help_matter, (20, 20)))
+        blit_seq.append((live_surface, (20, SCREEN_SIZE[1] - 60)))
 
     # Check for pygame events - keyboard, etc.
     # Note: A key press is not recorded as a PyGame event if you are 
     # connecting via SSH.  In that case, use --sp_min/max and --v_min/max
     # command line options to set scales.
 
+    # Drop a key press that repeats the one just before it (same key and
+    # shift state), so that auto-repeat from a held-down key is handled at
+    # most once per frame.  RETURN steps the help phase, so keep every one.
+    events = []
+    last_key = None
     for event in pg.event.get():
+        if event.type in EXPOSE_EVENTS:
+            window_exposed = True  # Repaint everything next frame
+        elif event.type == pg.KEYDOWN:
+            key = (event.key, bool(event.mod & (pg.KMOD_LSHIFT | pg.KMOD_RSHIFT)))
+            if key == last_key and event.key != pg.K_RETURN:
+                continue
+            last_key = key
+            events.append(event)
+        elif event.type == pg.QUIT:
+            events.append(event)
+
+    for event in events:
         if event.type == pg.QUIT:
             quit_all()
         elif event.type == pg.KEYDOWN:
@@ -811,7 +890,7 @@ while True:
                         if sp_max > -130 and sp_max > sp_min + 10:
                             sp_max -= 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_l:  # 'l' or 'L' - chg lower dB
                     if shifted:  # 'L' move up lower dB
                         if sp_min < sp_max - 10:
@@ -820,7 +899,7 @@ while True:
                         if sp_min > -140:
                             sp_min -= 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_b:  # 'b' or 'B' - chg upper pal.
                     if shifted:
                         if v_max < -10:
@@ -840,7 +919,7 @@ while True:
                 elif event.key == pg.K_r:  # 'r' or 'R' = reset levels
                     sp_min, sp_max = sp_min_def, sp_max_def
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                     if opt.waterfall:
                         v_min, v_max = mywf.reset_range()
 
@@ -890,22 +969,22 @@ while True:
                     if sp_max < 0:
                         sp_max += 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_DOWN:
                     if sp_max > -130 and sp_max > sp_min + 10:
                         sp_max -= 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_RIGHT:
                     if sp_min < sp_max - 10:
                         sp_min += 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_LEFT:
                     if sp_min > -140:
                         sp_min -= 10
                     mygraticule.set_range(sp_min, sp_max)
-                    surf_2d_graticule = mygraticule.make()
+                    graticule_dirty = True  # Remade after all events are handled
                 elif event.key == pg.K_RETURN:
                     info_phase = 3 if opt.waterfall \
                         else 0  # Next is phase 3 unless no WF.
@@ -934,8 +1013,22 @@ while True:
                 elif event.key == pg.K_RETURN:
                     info_phase = 0  # Turn OFF overlay
                     info_counter = 0
-    # Finally, update display for user
-    pg.display.update()
+
+    # Remake the graticule once for all of this frame's range changes.
+    # (Right away, so that the grid always matches the curve's scale.)
+    if graticule_dirty:
+        surf_2d_graticule = mygraticule.make()
+        graticule_dirty = False
+        redraw_2d = True  # Show the new graticule next frame
+
+    # Finally, draw this frame's surfaces and update changed parts of
+    # the display for user
+    dirty_rects.extend(surf_main.blits(blit_seq))
+    pg.display.update(dirty_rects)
+    full_redraw = False
+
+    # Wait out the rest of this frame's time, if any
+    clock.tick(target_fps)
 
     # End of main loop
 
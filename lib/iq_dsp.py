@@ -24,8 +24,47 @@
 # 01-04-2014 Initial Release
 
 import math
+import os
 import numpy as np
-import numpy.fft as fft  # FFT module from NumPy
+
+# Use the fastest FFT available: FFTW, then SciPy, then NumPy.
+try:
+    import pyfftw
+    import pyfftw.builders
+    import pyfftw.interfaces.numpy_fft as fft  # FFTW with NumPy's interface
+    pyfftw.interfaces.cache.enable()  # Keep FFTW plans between calls
+    FFT_KWARGS = dict(threads=os.cpu_count() or 1)  # Use all CPUs
+    HAVE_FFTW = True
+except ImportError:
+    HAVE_FFTW = False
+    try:
+        import scipy.fft as fft  # pocketfft from SciPy: SIMD kernels, worker threads
+        FFT_KWARGS = dict(workers=-1)  # Use all CPUs
+    except ImportError:
+        import numpy.fft as fft  # FFT module from NumPy
+        FFT_KWARGS = dict()
+
+
+def fast_fft_size(n):
+    """Find the largest FFT size not above n that is fast to transform.
+
+    Sizes of the form 2**a * 3**b * 5**c are handled efficiently by the
+    mixed-radix FFT, so they need not be restricted to powers of two.
+
+    Args:
+        n (int): Upper limit for the size
+
+    Returns:
+        int: The chosen size (1 if n < 1)
+    """
+    for size in range(n, 1, -1):
+        m = size
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return size
+    return 1
 
 
 class DSP(object):
@@ -49,13 +88,30 @@ class DSP(object):
         self.db_adjust = 20. * math.log10(self.opt.size * 2 ** 15)
 
         self.rejected_count = 0  # Counter for rejected buffers due to noise pulses
+        self.td_level = None  # Running average of time-domain signal level
         self.led_clip_ct = 0  # Counter for clipping indicator (e.g., for GUI LED)
 
-        # Precompute Hanning window to reduce spectral leakage
+        # Precompute Hanning window to reduce spectral leakage (single precision,
+        # so that windowed data stays complex64)
         # Hanning: 0.5 * (1 - cos(2πi / (N-1))) for i = 0 to N-1
-        self.w = np.empty(self.opt.size)  # Array for window coefficients
-        for i in range(self.opt.size):
-            self.w[i] = 0.5 * (1. - math.cos((2 * math.pi * i) / (self.opt.size - 1)))
+        self.w = np.hanning(self.opt.size).astype(np.float32)  # Window coefficients
+
+        # Scratch arrays, reused on every call: sample magnitudes, DC-free
+        # (then windowed) samples, and the power of each buffer
+        self.td_abs = np.empty((self.opt.buffers, self.opt.size), dtype=np.float32)
+        self.fd_power = np.empty((self.opt.buffers, self.opt.size), dtype=np.float32)
+        if HAVE_FFTW:
+            # Size and buffer count are fixed, so plan the FFT of a whole chunk
+            # once, measured for this size, working straight on td_work.
+            self.td_work = pyfftw.empty_aligned((self.opt.buffers, self.opt.size),
+                                                dtype=np.complex64)
+            self.fft_plan = pyfftw.builders.fft(self.td_work, axis=1,
+                                                overwrite_input=True, avoid_copy=True,
+                                                planner_effort='FFTW_MEASURE',
+                                                **FFT_KWARGS)
+        else:
+            self.td_work = np.empty((self.opt.buffers, self.opt.size), dtype=np.complex64)
+            self.fft_plan = None  # No planned FFT; use fft.fft on each chunk
 
         return  # Explicit return not needed, kept for original code fidelity
 
@@ -66,62 +122,99 @@ class DSP(object):
         applies a window function, computes FFT, and returns the log power spectrum.
 
         Args:
-            data (np.array): Complex I/Q samples (length >= opt.size * opt.buffers)
+            data (np.array): Complex I/Q samples (length >= opt.size * opt.buffers),
+                preferably complex64.  Other types are converted to complex64,
+                except real samples, which are converted to float32 and use
+                a real FFT.
 
         Returns:
             np.array: Log power spectrum in dB, adjusted so max signal = 0 dB
         """
         size = self.opt.size  # FFT size (number of samples per buffer)
-        power_spectrum = np.zeros(size)  # Initialize power spectrum accumulator
+        real_input = np.isrealobj(data)  # Real samples (no Q channel)?
+        # Single precision throughout
+        data = np.asarray(data, dtype=np.float32 if real_input else np.complex64)
+
+        # View the chunk as one buffer per row, so that all buffers are
+        # processed together by single NumPy calls.
+        td_segments = data[:size * self.opt.buffers].reshape(self.opt.buffers, size)
 
         # --- Noise Pulse Rejection ---
         # Analyze time-domain data to reject buffers with large pulses
-        # Use median of absolute values from first buffer as "normal" signal level
-        td_median = np.median(np.abs(data[:size]))  # Median of first buffer
-        td_threshold = self.opt.pulse * td_median  # Threshold for pulse detection
-        nbuf_taken = 0  # Count of accepted buffers
-
-        # Process each buffer in the chunk
-        for ic in range(self.opt.buffers):
-            # Extract one buffer’s worth of data
-            td_segment = data[ic * size:(ic + 1) * size]
-
-            # Remove DC offset (0 Hz spike) by subtracting mean
-            td_segment = np.subtract(td_segment, np.average(td_segment))
-
-            # Check for noise pulses by finding max absolute value
-            td_max = np.amax(np.abs(td_segment))
-            if td_max < td_threshold:  # Accept buffer if below threshold
-                # Apply Hanning window to reduce spectral leakage
-                td_segment *= self.w
-
-                # Compute FFT to transform to frequency domain
-                fd_spectrum = fft.fft(td_segment)
-
-                # Shift FFT so 0 Hz is in the center (originally at index 0)
-                fd_spectrum_rot = np.fft.fftshift(fd_spectrum)
-
-                # Compute power spectrum: |z|^2 = z * z conjugate
-                # Accumulate into power_spectrum
-                power_spectrum += np.real(fd_spectrum_rot * fd_spectrum_rot.conj())
-                nbuf_taken += 1
-            else:  # Reject buffer if noise pulse detected
-                self.rejected_count += 1  # Increment rejection counter
-                self.led_clip_ct = 1  # Set clipping indicator for GUI
-                # Optional debug output (commented out)
-                # if DEBUG: print "REJECT! %d" % self.rejected_count
-
-        # --- Normalize and Convert to dB ---
+        # Use a running average of the first buffer's mean absolute value as the
+        # "normal" signal level (cheaper than a median, and steadier)
+        td_abs = np.abs(td_segments[0], out=self.td_abs[0])  # (In scratch array)
+        level = np.mean(td_abs)  # Mean level of first buffer
+        if self.td_level is None:
+            self.td_level = level
+        else:
+            self.td_level = 0.9 * self.td_level + 0.1 * level
+        td_threshold = self.opt.pulse * self.td_level  # Threshold for pulse detection
+
+        # Remove DC offset (0 Hz spike) by subtracting each buffer's mean,
+        # into the scratch array (first half of each row for real samples)
+        if real_input:
+            td_work = self.td_work.view(np.float32)[:, :size]
+        else:
+            td_work = self.td_work
+        td_segments = np.subtract(td_segments, td_segments.mean(axis=1, keepdims=True),
+                                  out=td_work)
+
+        # Check for noise pulses by finding max absolute value of each buffer
+        td_max = np.abs(td_segments, out=self.td_abs).max(axis=1)
+        accept = td_max < td_threshold  # Accept buffers below threshold
+        nbuf_taken = int(np.count_nonzero(accept))  # Count of accepted buffers
+        if nbuf_taken < self.opt.buffers:  # Reject buffers with noise pulses
+            self.rejected_count += self.opt.buffers - nbuf_taken  # Rejection counter
+            self.led_clip_ct = 1  # Set clipping indicator for GUI
+            # Optional debug output (commented out)
+            # if DEBUG: print "REJECT! %d" % self.rejected_count
+
         if nbuf_taken > 0:
+            # Apply Hanning window to reduce spectral leakage.  td_segments is
+            # the scratch array, so window it in place; only pick out the
+            # accepted rows (a copy) when some buffers were rejected.
+            td_segments *= self.w
+            if nbuf_taken < self.opt.buffers:
+                td_segments = td_segments[accept]
+
+            # Compute FFT of every accepted buffer to transform to frequency domain
+            # Real input has a symmetric spectrum, so the real FFT (half the
+            # work) gives bins 0 ... size // 2 and the rest are mirrored below.
+            if real_input:
+                fd_spectra = fft.rfft(td_segments, axis=1, **FFT_KWARGS)
+            elif self.fft_plan is not None and nbuf_taken == self.opt.buffers:
+                fd_spectra = self.fft_plan()  # All of td_work, with the fixed plan
+            else:
+                fd_spectra = fft.fft(td_segments, axis=1, **FFT_KWARGS)
+
+            # Compute power spectrum |z|^2 in the scratch array (no temporaries)
+            # Sum over accepted buffers
+            fd_power = self.fd_power[:nbuf_taken, :fd_spectra.shape[1]]
+            np.abs(fd_spectra, out=fd_power)  # |z|
+            fd_power *= fd_power  # |z|^2
+            power_spectrum = fd_power.sum(axis=0)
+            if real_input:  # Negative frequency bins mirror the positive ones
+                power_spectrum = np.concatenate(
+                    (power_spectrum, power_spectrum[(size + 1) // 2 - 1:0:-1]))
+
+            # Shift so 0 Hz is in the center (originally at index 0).
+            # Done once, on the real sum, rather than on each complex spectrum.
+            power_spectrum = np.fft.fftshift(power_spectrum)
+
             # Average power spectrum over accepted buffers
-            power_spectrum = power_spectrum / nbuf_taken
+            power_spectrum /= nbuf_taken
         else:
             # If all buffers rejected, return flat spectrum (1’s)
-            power_spectrum = np.ones(size)
+            power_spectrum = np.ones(size, dtype=np.float32)
 
-        # Convert power to dB: 10 * log10(power)
+        # --- Convert to dB ---
+        # Convert the averaged float32 power to dB: 10 * log10(power), in place
+        # (power_spectrum is a new array on every call, so it can be returned)
         # Note: log(0) results in -inf, which can occur if ADC fails
-        log_power_spectrum = 10. * np.log10(power_spectrum)
+        log_power_spectrum = np.log10(power_spectrum, out=power_spectrum)
+        log_power_spectrum *= 10.
 
         # Adjust so max possible signal (full-scale input) is 0 dB
-        return log_power_spectrum - self.db_adjust
\ No newline at end of file
+        log_power_spectrum -= self.db_adjust
+        return log_power_spectrum
\ No newline at end of file
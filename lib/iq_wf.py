@@ -23,54 +23,54 @@
 # HISTORY
 # 01-04-2014 Initial release
 
-import math
 import sys
-
 import numpy as np
 import pygame as pg
 
+# Palette lookup tables, keyed by (palette, n), built on first use
+palette_luts = dict()
+
 
-def palette_color(palette, val, vmin0, vmax0):
-    """Translate a data value into a color using different palette methods.
+def build_palette_lut(palette, n=256):
+    """Build a color lookup table for one of the palettes.
+
+    Entry i is the color for a normalized value f = i / (n - 1).  Callers
+    map a data value to f as (val - vmin) / (vmax - vmin) * 2, clamped to
+    0-1, and index the table with it.
 
     Args:
-        palette (int): Color scheme selection (1 or 2)
-        val (float): Data value to convert to color
-        vmin0 (float): Minimum value for color scale
-        vmax0 (float): Maximum value for color scale
+        palette (int): 0 for black, 1 for stepped RGB (red-yellow-white),
+            2 for rainbow
+        n (int): Number of table entries
 
     Returns:
-        tuple: RGB color values (r, g, b) between 0-255
+        np.array: (n, 3) uint8 RGB values
     """
-    # Normalize value to 0-1 range, then scale to 0-2
-    f = (float(val) - vmin0) / (vmax0 - vmin0)  # btw 0 and 1.0
-    f *= 2
-    f = min(1., max(0., f))  # Clamp value between 0 and 1
-
-    if palette == 1:  # Simple RGB stepped palette
-        g, b = 0, 0
-        if f < 0.333:  # Red phase
-            r = int(f * 255 * 3)
-        elif f < 0.666:  # Yellow phase (red + green)
-            r = 200
-            g = int((f - .333) * 255 * 3)
-        else:  # White phase (red + green + blue)
-            r = 200
-            g = 200
-            b = int((f - .666) * 255 * 3)
+    key = (palette, n)
+    if key in palette_luts:
+        return palette_luts[key]
+    f = np.linspace(0., 1., n)
+    if palette == 0:
+        rgb = np.zeros((n, 3))
+    elif palette == 1:  # Simple RGB stepped palette
+        phase = [f < 0.333, f < 0.666]  # Red, then yellow, then white phase
+        r = np.select(phase, [f * 255 * 3, 200], 200)  # Red ramps up, then fixed
+        g = np.select(phase, [0, (f - .333) * 255 * 3], 200)  # Up in yellow phase
+        b = np.select(phase, [0, 0], (f - .666) * 255 * 3)  # Up in white phase
+        rgb = np.stack((r, g, b), axis=1)
     elif palette == 2:  # Continuous rainbow palette
-        bright = min(1.0, f + 0.15)  # Brightness adjustment
-        tpi = 2 * math.pi
+        bright = np.minimum(1.0, f + 0.15)  # Brightness adjustment
+        tpi = 2 * np.pi
         # Use cosine waves with phase shifts for smooth color transitions
-        r = bright * 128 * (1.0 + math.cos(tpi * f))
-        g = bright * 128 * (1.0 + math.cos(tpi * f + tpi / 3))
-        b = bright * 128 * (1.0 + math.cos(tpi * f + 2 * tpi / 3))
+        phase = np.array([0., tpi / 3, 2 * tpi / 3])
+        rgb = bright[:, None] * 128 * (1.0 + np.cos(tpi * f[:, None] + phase))
     else:
         print("Invalid palette requested!")
         sys.exit()
 
     # Ensure color values stay within valid RGB range (0-255)
-    return max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+    palette_luts[key] = np.clip(rgb, 0, 255).astype(np.uint8)
+    return palette_luts[key]
 
 
 class Wf(object):
@@ -93,33 +93,29 @@ class Wf(object):
         self.vmax_rst = vmax  # Store reset value
         self.nsteps = nsteps
         self.pixel_size = pxsz
+        self.lut = build_palette_lut(opt.waterfall_palette)  # (n, 3) RGB for f = 0 ... 1
         self.firstcalc = True  # Flag for initial calculation
         self.initialize_palette()
 
     def initialize_palette(self):
-        """Create a list of pre-rendered surfaces for each color step."""
-        self.pixels = list()
-        for istep in range(self.nsteps):
-            # Create a new surface for each color step
-            ps = pg.Surface(self.pixel_size)
-            # Calculate corresponding data value for this step
-            val = float(istep) * (self.vmax - self.vmin) / self.nsteps + self.vmin
-            # Get RGB color for this value
-            color = palette_color(self.opt.waterfall_palette, val, self.vmin, self.vmax)
-            ps.fill(color)  # Fill surface with color
-            self.pixels.append(ps)
+        """Pick the RGB color of each color step from the palette lookup table.
+
+        Step i covers data values from i / nsteps of the way up the range.
+        The palette runs through its colors over the lower half of the range,
+        so the colors do not depend on vmin and vmax.
+        """
+        f = np.minimum(2. * np.arange(self.nsteps) / self.nsteps, 1.)
+        self.palette = self.lut[(f * (len(self.lut) - 1)).astype(int)]  # (nsteps, 3)
 
     def set_range(self, vmin, vmax):
-        """Update the data range and regenerate the color palette."""
+        """Update the data range used for color scaling."""
         self.vmin = vmin
         self.vmax = vmax
-        self.initialize_palette()
 
     def reset_range(self):
-        """Restore original data range and regenerate palette."""
+        """Restore original data range."""
         self.vmin = self.vmin_rst
         self.vmax = self.vmax_rst
-        self.initialize_palette()
         return self.vmin, self.vmax
 
     def calculate(self, datalist, nsum, surface):
@@ -129,11 +125,20 @@ class Wf(object):
             datalist (np.array): Input spectral data
             nsum (int): Number of spectra to accumulate before updating
             surface: Pygame surface to draw on
+
+        Returns:
+            bool: True if a new line was drawn on the surface
         """
         if self.firstcalc:  # Initial setup
             self.datasize = len(datalist)  # Store data length
             self.wfacc = np.zeros(self.datasize)  # Accumulator array
-            self.dx = float(surface.get_width()) / self.datasize  # Horizontal pixel spacing
+            width = surface.get_width()
+            # Data point shown in each pixel column of the surface
+            self.col_index = np.arange(width) * self.datasize // width
+            # New rows are drawn in this strip at the top of the surface
+            self.row_height = int(self.pixel_size[1])
+            self.row_surface = surface.subsurface((0, 0, width, self.row_height))
+            self.row_pixels = np.empty((width, self.row_height, 3), dtype=np.uint8)
             self.wfcount = 0
             self.firstcalc = False
 
@@ -141,21 +146,20 @@ class Wf(object):
         self.wfacc += datalist  # Add new data to accumulator
 
         if self.wfcount % nsum != 0:  # Wait for nsum spectra before updating
-            return
+            return False
 
-        # Shift existing waterfall down by one row
-        surface.blit(surface, (0, self.pixel_size[1]))
+        # Shift existing waterfall down by one row, in place
+        surface.scroll(0, self.row_height)
 
-        # Draw new row
-        for ix in range(self.datasize):
-            v = datalist[ix]  # Get data value (in dB)
-            # Convert to palette index
-            vi = int(self.nsteps * (v - self.vmin) / (self.vmax - self.vmin))
-            vi = max(0, min(vi, self.nsteps - 1))  # Clamp to valid range
-            px_surf = self.pixels[vi]  # Get pre-rendered color surface
-            x = int(ix * self.dx)  # Calculate x position
-            surface.blit(px_surf, (x, 0))  # Draw pixel
+        # Draw new row: data value (in dB) shown in each pixel column, its
+        # palette index clamped to valid range, then the column colors.
+        vi = ((datalist[self.col_index] - self.vmin)
+              * (self.nsteps / (self.vmax - self.vmin))).astype(np.int32)
+        np.clip(vi, 0, self.nsteps - 1, out=vi)
+        self.row_pixels[:] = self.palette[vi][:, None, :]  # Same color down each column
+        pg.surfarray.blit_array(self.row_surface, self.row_pixels)
 
         # Reset for next accumulation cycle
         self.wfcount = 0
-        self.wfacc.fill(0)
\ No newline at end of file
+        self.wfacc.fill(0)
+        return True